@@ -5,9 +5,10 @@ import time
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+import scipy.special
 import scipy.stats
 import statsmodels.api as sm
-from numpy.linalg import inv
+from scipy.linalg import cho_factor, cho_solve
 from scipy.optimize import minimize
 
 
@@ -25,18 +26,40 @@ def terminal_wealth(s):
 def compound_returns(s, start=100):
     """
     Compound a pd.Dataframe or pd.Series of returns from an initial default value equal to 100.
-    In the former case, the method compounds the returns for every column (Series) by using pd.aggregate.
+    In the former case, the method compounds the returns for every column (Series) at once.
     The method returns a pd.Dataframe or pd.Series - using cumprod().
     See also the COMPOUND method.
     """
     if isinstance(s, pd.DataFrame):
-        return s.aggregate(compound_returns, start=start)
+        return pd.DataFrame(
+            _wealth_index(s.values, start=start), index=s.index, columns=s.columns
+        )
     elif isinstance(s, pd.Series):
-        return start * (1 + s).cumprod()
+        return pd.Series(
+            _wealth_index(s.values, start=start), index=s.index, name=s.name
+        )
     else:
         raise TypeError("Expected pd.DataFrame or pd.Series")
 
 
+def _wealth_index(x, start=100):
+    """
+    Compounds a np.array of returns (along the first axis) from an initial value start.
+    The wealth index is built in place in a single buffer, without pandas intermediates.
+    As pd.cumprod, missing returns are skipped and left as NaN in the wealth index.
+    """
+    wealth = np.add(x, 1.0)
+    missing = np.isnan(wealth)
+    has_missing = missing.any()
+    if has_missing:
+        wealth[missing] = 1.0
+    np.cumprod(wealth, axis=0, out=wealth)
+    wealth *= start
+    if has_missing:
+        wealth[missing] = np.nan
+    return wealth
+
+
 def drawdown(rets: pd.Series, start=1000):
     """
     Compute the drawdowns of an input pd.Series of returns.
@@ -45,21 +68,39 @@ def drawdown(rets: pd.Series, start=1000):
     2. all previous peaks
     3. the drawdowns
     """
-    wealth_index = compound_returns(rets, start=start)
-    previous_peaks = wealth_index.cummax()
-    drawdowns = (wealth_index - previous_peaks) / previous_peaks
+    wealth_index, previous_peaks, drawdowns = _drawdown(rets.values, start=start)
     df = pd.DataFrame(
-        {"Wealth": wealth_index, "Peaks": previous_peaks, "Drawdown": drawdowns}
+        {"Wealth": wealth_index, "Peaks": previous_peaks, "Drawdown": drawdowns},
+        index=rets.index,
     )
     return df
 
 
+def _drawdown(x, start=1000):
+    """
+    Returns the wealth index, the previous peaks and the drawdowns of a np.array of returns
+    (along the first axis), each one allocated only once.
+    As pd.cummax, the peaks skip the missing values, which are left as NaN.
+    """
+    wealth_index = _wealth_index(x, start=start)
+    previous_peaks = np.fmax.accumulate(wealth_index, axis=0)
+    missing = np.isnan(wealth_index)
+    if missing.any():
+        previous_peaks[missing] = np.nan
+    drawdowns = np.subtract(wealth_index, previous_peaks)
+    drawdowns /= previous_peaks
+    return wealth_index, previous_peaks, drawdowns
+
+
 def skewness(s):
     """
     Computes the Skewness of the input Series or Dataframe.
     There is also the function scipy.stats.skew().
     """
-    return (((s - s.mean()) / s.std(ddof=0)) ** 3).mean()
+    S = _moments(np.asarray(s))[2]
+    if isinstance(s, pd.DataFrame):
+        return pd.Series(S, index=s.columns)
+    return S
 
 
 def kurtosis(s):
@@ -68,7 +109,29 @@ def kurtosis(s):
     There is also the function scipy.stats.kurtosis() which, however,
     computes the "Excess Kurtosis", i.e., Kurtosis minus 3
     """
-    return (((s - s.mean()) / s.std(ddof=0)) ** 4).mean()
+    K = _moments(np.asarray(s))[3]
+    if isinstance(s, pd.DataFrame):
+        return pd.Series(K, index=s.columns)
+    return K
+
+
+def _moments(x):
+    """
+    Returns mean, standard deviation (ddof=0), skewness and kurtosis of a np.array (along the first axis).
+    The central moments are accumulated from a single buffer of deviations from the mean,
+    raised in place to the 2nd, 3rd and 4th power.
+    As the pandas methods, missing values are skipped.
+    """
+    average = np.nanmean if np.isnan(x).any() else np.mean
+    mean = average(x, axis=0)
+    dev = x - mean
+    dev2 = dev * dev
+    m2 = average(dev2, axis=0)
+    dev *= dev2
+    m3 = average(dev, axis=0)
+    dev2 *= dev2
+    m4 = average(dev2, axis=0)
+    return mean, np.sqrt(m2), m3 / m2**1.5, m4 / m2**2
 
 
 def exkurtosis(s):
@@ -88,6 +151,17 @@ def is_normal(s, level=0.01):
     return pvalue > level
 
 
+def is_normal_from_moments(n, S, K, level=0.01):
+    """
+    Jarque-Bera test from the (already computed) skewness S and kurtosis K of a series of n returns,
+    e.g., the ones of summary_stats. Returns True or False according to whether the p-value is larger
+    than the default level=0.01.
+    """
+    statistic = n / 6 * (S**2 + (K - 3) ** 2 / 4)
+    pvalue = scipy.stats.chi2.sf(statistic, 2)
+    return pvalue > level
+
+
 def semivolatility(s):
     """
     Returns the semivolatility of a series, i.e., the volatility of
@@ -101,16 +175,40 @@ def var_historic(s, level=0.05):
     Returns the (1-level)% VaR using historical method.
     By default it computes the 95% VaR, i.e., alpha=0.95 which gives level 1-alpha=0.05.
     The method takes in input either a DataFrame or a Series and, in the former
-    case, it computes the VaR for every column (Series) by using pd.aggregate
+    case, it computes the VaR for every column (Series) at once.
+    The VaR of a Series (column) with missing values is NaN.
     """
     if isinstance(s, pd.DataFrame):
-        return s.aggregate(var_historic, level=level)
+        return pd.Series(_var_cvar_historic(s.values, level=level)[0], index=s.columns)
     elif isinstance(s, pd.Series):
-        return -np.percentile(s, level * 100)
+        return _var_cvar_historic(s.values, level=level)[0]
     else:
         raise TypeError("Expected pd.DataFrame or pd.Series")
 
 
+def _var_cvar_historic(x, level=0.05):
+    """
+    Returns both the (1-level)% historic VaR and CVaR of a np.array of returns (along the first axis).
+    A single partial sort (np.partition) gives the level-quantile, with the same linear interpolation
+    of np.percentile, and leaves the returns below it at the front of the array.
+    As np.percentile, VaR and CVaR are NaN for the series (columns) with missing values.
+    """
+    pos = level * (x.shape[0] - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, x.shape[0] - 1)
+    part = np.partition(x, [lo, hi], axis=0)
+    quantile = part[lo] + (part[hi] - part[lo]) * (pos - lo)
+    # np.partition moves the NaNs to the end, which would silently shift the quantile
+    # ([()] gives back a scalar for a 1D array)
+    quantile = np.where(np.isnan(x).any(axis=0), np.nan, quantile)[()]
+    # only the first hi+1 returns of the partitioned array can be less than the quantile
+    tail = part[: hi + 1]
+    below = tail < quantile
+    with np.errstate(invalid="ignore"):
+        cvar = -np.sum(tail, axis=0, where=below) / below.sum(axis=0)
+    return -quantile, cvar
+
+
 def var_gaussian(s, level=0.05, cf=False):
     """
     Returns the (1-level)% VaR using the parametric Gaussian method.
@@ -120,18 +218,43 @@ def var_gaussian(s, level=0.05, cf=False):
     The method takes in input either a DataFrame or a Series and, in the former
     case, it computes the VaR for every column (Series).
     """
-    # alpha-quantile of Gaussian distribution
-    za = scipy.stats.norm.ppf(level, 0, 1)
+    x = np.asarray(s)
     if cf:
-        S = skewness(s)
-        K = kurtosis(s)
+        mean, std, S, K = _moments(x)
+        var = _var_gaussian_from_moments(mean, std, level=level, S=S, K=K)
+    else:
+        # only mean and standard deviation (ddof=0) are needed, skipping missing values as _moments
+        missing = np.isnan(x).any()
+        mean = (np.nanmean if missing else np.mean)(x, axis=0)
+        std = (np.nanstd if missing else np.std)(x, axis=0)
+        var = _var_gaussian_from_moments(mean, std, level=level)
+    if isinstance(s, pd.DataFrame):
+        return pd.Series(var, index=s.columns)
+    return var
+
+
+# alpha-quantiles of the standard Gaussian distribution for the most common levels
+_Z_CACHE = {0.05: -1.6448536269514729, 0.01: -2.3263478740408408}
+
+
+def _var_gaussian_from_moments(mean, std, level=0.05, S=None, K=None):
+    """
+    Returns the (1-level)% parametric Gaussian VaR from the (already computed) mean and
+    standard deviation (ddof=0) of the returns.
+    If skewness S and kurtosis K are given, the Cornish-Fisher modified VaR is returned.
+    """
+    # alpha-quantile of Gaussian distribution
+    za = _Z_CACHE.get(level)
+    if za is None:
+        za = scipy.special.ndtri(level)
+    if S is not None and K is not None:
         za = (
             za
             + (za**2 - 1) * S / 6
             + (za**3 - 3 * za) * (K - 3) / 24
             - (2 * za**3 - 5 * za) * (S**2) / 36
         )
-    return -(s.mean() + za * s.std(ddof=0))
+    return -(mean + za * std)
 
 
 def cvar_historic(s, level=0.05):
@@ -139,15 +262,14 @@ def cvar_historic(s, level=0.05):
     Computes the (1-level)% Conditional VaR (based on historical method).
     By default it computes the 95% CVaR, i.e., alpha=0.95 which gives level 1-alpha=0.05.
     The method takes in input either a DataFrame or a Series and, in the former
-    case, it computes the VaR for every column (Series).
+    case, it computes the VaR for every column (Series) at once.
+    The CVaR of a Series (column) with missing values is NaN.
     """
     if isinstance(s, pd.DataFrame):
-        return s.aggregate(cvar_historic, level=level)
+        return pd.Series(_var_cvar_historic(s.values, level=level)[1], index=s.columns)
     elif isinstance(s, pd.Series):
-        # find the returns which are less than (the historic) VaR
-        mask = s < -var_historic(s, level=level)
-        # and of them, take the mean
-        return -s[mask].mean()
+        # mean of the returns which are less than (the historic) VaR
+        return _var_cvar_historic(s.values, level=level)[1]
     else:
         raise TypeError("Expected pd.DataFrame or pd.Series")
 
@@ -158,10 +280,15 @@ def annualize_rets(s, periods_per_year):
     The variable periods_per_year can be, e.g., 12, 52, 252, in
     case of monthly, weekly, and daily data.
     The method takes in input either a DataFrame or a Series and, in the former
-    case, it computes the annualized return for every column (Series) by using pd.aggregate
+    case, it computes the annualized return for every column (Series) at once
     """
     if isinstance(s, pd.DataFrame):
-        return s.aggregate(annualize_rets, periods_per_year=periods_per_year)
+        # as pd.prod, missing returns are skipped
+        growth = np.nanprod(1 + s.values, axis=0)
+        n_period_growth = s.shape[0]
+        return pd.Series(
+            growth ** (periods_per_year / n_period_growth) - 1, index=s.columns
+        )
     elif isinstance(s, pd.Series):
         growth = (1 + s).prod()
         n_period_growth = s.shape[0]
@@ -175,11 +302,17 @@ def annualize_vol(s, periods_per_year, ddof=1):
     case of monthly, weekly, and daily data.
     The method takes in input either a DataFrame, a Series, a list or a single number.
     In the former case, it computes the annualized volatility of every column
-    (Series) by using pd.aggregate. In the latter case, s is a volatility
+    (Series) at once. In the latter case, s is a volatility
     computed beforehand, hence only annulization is done
     """
     if isinstance(s, pd.DataFrame):
-        return s.aggregate(annualize_vol, periods_per_year=periods_per_year)
+        x = s.values
+        # as pd.std, missing returns are skipped
+        std = np.nanstd if np.isnan(x).any() else np.std
+        return pd.Series(
+            std(x, ddof=ddof, axis=0) * (periods_per_year) ** (0.5),
+            index=s.columns,
+        )
     elif isinstance(s, pd.Series):
         return s.std(ddof=ddof) * (periods_per_year) ** (0.5)
     elif isinstance(s, list):
@@ -194,26 +327,20 @@ def sharpe_ratio(s, risk_free_rate, periods_per_year, v=None):
     The variable periods_per_year can be, e.g., 12, 52, 252, in case of yearly, weekly, and daily data.
     The variable risk_free_rate is the annual one.
     The method takes in input either a DataFrame, a Series or a single number.
-    In the former case, it computes the annualized sharpe ratio of every column (Series) by using pd.aggregate.
+    In the former case, it computes the annualized sharpe ratio of every column (Series) at once.
     In the latter case, s is the (allready annualized) return and v is the (already annualized) volatility
     computed beforehand, for example, in case of a portfolio.
+    For a DataFrame or a Series, v can be the (already annualized) volatility as well, if known, to avoid recomputing it.
     """
-    if isinstance(s, pd.DataFrame):
-        return s.aggregate(
-            sharpe_ratio,
-            risk_free_rate=risk_free_rate,
-            periods_per_year=periods_per_year,
-            v=None,
-        )
-    elif isinstance(s, pd.Series):
+    if isinstance(s, (pd.DataFrame, pd.Series)):
         # convert the annual risk free rate to the period assuming that:
         # RFR_year = (1+RFR_period)^{periods_per_year} - 1. Hence:
         rf_to_period = (1 + risk_free_rate) ** (1 / periods_per_year) - 1
         excess_return = s - rf_to_period
         # now, annualize the excess return
         ann_ex_rets = annualize_rets(excess_return, periods_per_year)
-        # compute annualized volatility
-        ann_vol = annualize_vol(s, periods_per_year)
+        # compute annualized volatility, unless given
+        ann_vol = annualize_vol(s, periods_per_year) if v is None else v
         return ann_ex_rets / ann_vol
     elif isinstance(s, (int, float)) and v is not None:
         # Portfolio case: s is supposed to be the single (already annnualized)
@@ -239,7 +366,22 @@ def portfolio_volatility(weights, cov_rets):
     It takes in input a vector of weights (np.array or pd.Series)
     and the covariance matrix of the portfolio asset returns
     """
-    return (np.dot(weights.T, np.dot(cov_rets, weights))) ** (0.5)
+    return np.sqrt(np.dot(weights, np.dot(cov_rets, weights)))
+
+
+def _portfolio_variance(weights, cov_rets):
+    """
+    Computes the variance of a portfolio, i.e., the square-root free objective of the
+    minimum volatility problem (same minimizer, quadratic objective)
+    """
+    return np.dot(weights, np.dot(cov_rets, weights))
+
+
+def _portfolio_variance_jac(weights, cov_rets):
+    """
+    Computes the gradient of the variance of a portfolio with respect to the weights
+    """
+    return 2 * np.dot(cov_rets, weights)
 
 
 def efficient_frontier(
@@ -260,110 +402,77 @@ def efficient_frontier(
     """
 
     ann_rets = annualize_rets(rets, periods_per_year)
+    # annualization factor of the volatility
+    sqrt_pp = np.sqrt(periods_per_year)
 
     # generates optimal weights of porfolios lying of the efficient frontiers
     weights = optimal_weights(n_portfolios, ann_rets, covmat, periods_per_year)
+    # as a (n_portfolios, n_assets) array, so that all portfolios are computed at once.
     # in alternative, if only the portfolio consists of only two assets, the weights can be:
-    # weights = [np.array([w,1-w]) for w in np.linspace(0,1,n_portfolios)]
+    # weights = np.array([[w, 1 - w] for w in np.linspace(0, 1, n_portfolios)])
 
     # portfolio returns
-    portfolio_ret = [portfolio_return(w, ann_rets) for w in weights]
+    portfolio_ret = weights @ np.asarray(ann_rets)
 
     # portfolio volatility
-    vols = [portfolio_volatility(w, covmat) for w in weights]
-    portfolio_vol = [annualize_vol(v, periods_per_year) for v in vols]
+    # i.e., row-wise w'Qw, with the product of all the weights by the covariance matrix as one GEMM
+    vols = np.sqrt(((weights @ np.asarray(covmat)) * weights).sum(axis=1))
+    portfolio_vol = vols * sqrt_pp
 
     # portfolio sharpe ratio
-    portfolio_spr = [
-        sharpe_ratio(r, risk_free_rate, periods_per_year, v=v)
-        for r, v in zip(portfolio_ret, portfolio_vol)
-    ]
+    portfolio_spr = (portfolio_ret - risk_free_rate) / portfolio_vol
 
     # dataframe for efficient frontier
-    ef = pd.DataFrame(weights, columns=rets.columns)
-    ef = ef.join(
-        pd.DataFrame(
-            {
-                "Volatility": portfolio_vol,
-                "Return": portfolio_ret,
-                "Sharpe Ratio": portfolio_spr,
-            }
-        )
+    ef = pd.DataFrame(
+        np.column_stack([weights, portfolio_vol, portfolio_ret, portfolio_spr]),
+        columns=[*rets.columns, "Volatility", "Return", "Sharpe Ratio"],
     )
 
     if plot:
         ax = ef.plot.line(x="Volatility", y="Return", label="Efficient Frontier")
 
-    # dataframe for maximum sharpe ratio portfolio
-    w = maximize_shape_ratio(ann_rets, covmat, risk_free_rate, periods_per_year)
-    ret = portfolio_return(w, ann_rets)
-    vol = annualize_vol(portfolio_volatility(w, covmat), periods_per_year)
-    spr = sharpe_ratio(ret, risk_free_rate, periods_per_year, v=vol)
-    df_msr = pd.DataFrame(
-        np.array([np.append(w, [vol, ret, spr], axis=0)]), columns=ef.columns
-    )
-
-    if plot:
-        df_msr.plot.scatter(
-            x="Volatility",
-            y="Return",
-            ax=ax,
-            color="g",
-            marker="o",
-            label="Maximum Sharpe Ratio",
-        )
-
-        ax.plot(
-            [0, vol],
-            [risk_free_rate, ret],
-            color="g",
-            linestyle="--",
-            label="Capital Market Line",
-        )
-
-    # dataframe for minimum volatility portfolio
-    w = minimize_volatility(ann_rets, covmat)
-    ret = portfolio_return(w, ann_rets)
-    vol = annualize_vol(portfolio_volatility(w, covmat), periods_per_year)
-    spr = sharpe_ratio(ret, risk_free_rate, periods_per_year, v=vol)
-    df_mvp = pd.DataFrame(
-        np.array([np.append(w, [vol, ret, spr], axis=0)]), columns=ef.columns
+    # weights of the special portfolios
+    w_msr = maximize_shape_ratio(ann_rets, covmat, risk_free_rate, periods_per_year)
+    w_mvp = minimize_volatility(ann_rets, covmat)
+    w_ewp = np.repeat(1 / ann_rets.shape[0], ann_rets.shape[0])
+    special_weights = np.vstack([w_msr, w_mvp, w_ewp])
+
+    # returns, volatility and sharpe ratio of the special portfolios, all at once as above
+    special_ret = special_weights @ np.asarray(ann_rets)
+    special_vol = (
+        np.sqrt(((special_weights @ np.asarray(covmat)) * special_weights).sum(axis=1))
+        * sqrt_pp
     )
+    special_spr = (special_ret - risk_free_rate) / special_vol
 
-    if plot:
-        df_mvp.plot.scatter(
-            x="Volatility",
-            y="Return",
-            ax=ax,
-            color="b",
-            marker="o",
-            label="Minimum Volatility",
-        )
-
-    # dataframe for equally weighted portfolio
-    w = np.repeat(1 / ann_rets.shape[0], ann_rets.shape[0])
-    ret = portfolio_return(w, ann_rets)
-    vol = annualize_vol(portfolio_volatility(w, covmat), periods_per_year)
-    spr = sharpe_ratio(ret, risk_free_rate, periods_per_year, v=vol)
-    df_ewp = pd.DataFrame(
-        np.array([np.append(w, [vol, ret, spr], axis=0)]), columns=ef.columns
+    # dataframe for special portfolios
+    df = pd.DataFrame(
+        np.column_stack([special_weights, special_vol, special_ret, special_spr]),
+        index=["Maximum Sharpe Ratio", "Minimum Volatility", "Equally Weighted"],
+        columns=ef.columns,
     )
 
     if plot:
-        df_ewp.plot.scatter(
-            x="Volatility",
-            y="Return",
-            ax=ax,
-            color="y",
-            marker="o",
-            label="Equally Weighted",
-        )
+        for name, color in zip(df.index, ["g", "b", "y"]):
+            df.loc[[name]].plot.scatter(
+                x="Volatility",
+                y="Return",
+                ax=ax,
+                color=color,
+                marker="o",
+                label=name,
+            )
+            if name == "Maximum Sharpe Ratio":
+                ax.plot(
+                    [0, special_vol[0]],
+                    [risk_free_rate, special_ret[0]],
+                    color="g",
+                    linestyle="--",
+                    label="Capital Market Line",
+                )
 
         ax.grid(True)
 
-    # create dataframe for special portfolios
-    df = pd.concat([df_msr, df_mvp, df_ewp])
-    df.index = ["Maximum Sharpe Ratio", "Minimum Volatility", "Equally Weighted"]
     return ef, df
 
 
@@ -373,38 +482,48 @@ def summary_stats(s, risk_free_rate=0.03, periods_per_year=12, var_level=0.05):
     skewness, kurtosis, historic VaR, Cornish-Fisher VaR, and Max Drawdown
     """
     if isinstance(s, pd.Series):
+        # moments of the returns are computed once and shared by the statistics below
+        x = s.values
+        mean, std, S, K = _moments(x)
+        ann_vol = annualize_vol(s, periods_per_year=periods_per_year)
         stats = {
             "Ann. return": annualize_rets(s, periods_per_year=periods_per_year),
-            "Ann. vol": annualize_vol(s, periods_per_year=periods_per_year),
+            "Ann. vol": ann_vol,
             "Sharpe ratio": sharpe_ratio(
-                s, risk_free_rate=risk_free_rate, periods_per_year=periods_per_year
+                s,
+                risk_free_rate=risk_free_rate,
+                periods_per_year=periods_per_year,
+                v=ann_vol,
             ),
-            "Skewness": skewness(s),
-            "Kurtosis": kurtosis(s),
-            "Historic CVar": cvar_historic(s, level=var_level),
-            "C-F Var": var_gaussian(s, level=var_level, cf=True),
-            "Max drawdown": drawdown(s)["Drawdown"].min(),
+            "Skewness": S,
+            "Kurtosis": K,
+            "Historic CVar": _var_cvar_historic(x, level=var_level)[1],
+            "C-F Var": _var_gaussian_from_moments(mean, std, level=var_level, S=S, K=K),
+            "Max drawdown": np.nanmin(_drawdown(x)[2]),
         }
         return pd.DataFrame(stats, index=["0"])
 
     elif isinstance(s, pd.DataFrame):
+        # same as above, every statistic is computed for all columns at once
+        x = s.values
+        mean, std, S, K = _moments(x)
+        ann_vol = annualize_vol(s, periods_per_year=periods_per_year)
         stats = {
-            "Ann. return": s.aggregate(
-                annualize_rets, periods_per_year=periods_per_year
-            ),
-            "Ann. vol": s.aggregate(annualize_vol, periods_per_year=periods_per_year),
-            "Sharpe ratio": s.aggregate(
-                sharpe_ratio,
+            "Ann. return": annualize_rets(s, periods_per_year=periods_per_year),
+            "Ann. vol": ann_vol,
+            "Sharpe ratio": sharpe_ratio(
+                s,
                 risk_free_rate=risk_free_rate,
                 periods_per_year=periods_per_year,
+                v=ann_vol,
             ),
-            "Skewness": s.aggregate(skewness),
-            "Kurtosis": s.aggregate(kurtosis),
-            "Historic CVar": s.aggregate(cvar_historic, level=var_level),
-            "C-F Var": s.aggregate(var_gaussian, level=var_level, cf=True),
-            "Max Drawdown": s.aggregate(lambda r: drawdown(r)["Drawdown"].min()),
+            "Skewness": S,
+            "Kurtosis": K,
+            "Historic CVar": _var_cvar_historic(x, level=var_level)[1],
+            "C-F Var": _var_gaussian_from_moments(mean, std, level=var_level, S=S, K=K),
+            "Max Drawdown": np.nanmin(_drawdown(x)[2], axis=0),
         }
-        return pd.DataFrame(stats)
+        return pd.DataFrame(stats, index=s.columns)
 
 
 def summary_stats_terminal(
@@ -447,26 +566,104 @@ def summary_stats_terminal(
 
 def optimal_weights(n_points, rets, covmatrix, periods_per_year):
     """
-    Returns a set of n_points optimal weights corresponding to portfolios (of the efficient frontier)
+    Returns a (n_points, n_assets) np.array of optimal weights corresponding to portfolios (of the efficient frontier)
     with minimum volatility constructed by fixing n_points target returns.
-    The weights are obtained by solving the minimization problem for the volatility.
+    The weights are obtained in closed form (two-fund theorem) by means of the Lagrange multipliers
+    of the problem with the constraints on the sum of weights and on the target return. The scipy
+    minimize optimizer is used only for those portfolios whose weights violate the bounds [0, 1].
     """
     target_rets = np.linspace(rets.min(), rets.max(), n_points)
-    weights = [minimize_volatility(rets, covmatrix, target) for target in target_rets]
+    mu = np.asarray(rets)
+    n_assets = mu.shape[0]
+    # one row of weights per target return, filled in place
+    weights = np.empty((n_points, n_assets))
+    cho = None
+    if np.isfinite(covmatrix).all(axis=None):
+        try:
+            # factor the covariance matrix once and reuse it for every target return
+            cho = cho_factor(covmatrix)
+        except np.linalg.LinAlgError:
+            pass
+
+    closed_form = cho is not None
+    if closed_form:
+        # A = Q^-1 1 and B = Q^-1 r from a single solve with two right hand sides
+        A, B = cho_solve(cho, np.column_stack([np.ones(n_assets), mu])).T
+        # solve [[1'A, 1'B], [r'A, r'B]] [lambda; gamma] = [1; target] for all target returns at once
+        a11, a12, a21, a22 = A.sum(), B.sum(), mu @ A, mu @ B
+        det = a11 * a22 - a12 * a21
+        # the 2x2 system is (numerically) singular, e.g., with a single asset or equal expected returns
+        closed_form = det > 1e3 * np.finfo(float).eps * a11 * a22
+
+    if closed_form:
+        lam = (a22 - target_rets * a12) / det
+        gam = (target_rets * a11 - a21) / det
+        np.outer(lam, A, out=weights)
+        weights += gam[:, None] * B
+        # the closed form solution ignores the bounds, hence resort to the optimizer if they are violated
+        # or if the solution is not accurate (e.g., an ill-conditioned covariance matrix)
+        out_of_bounds = (
+            ((weights < 0.0) | (weights > 1.0)).any(axis=1)
+            | ~np.isfinite(weights).all(axis=1)
+            | (np.abs(weights.sum(axis=1) - 1.0) > 1e-8)
+            | (np.abs(weights @ mu - target_rets) > 1e-8 * np.abs(mu).max())
+        )
+    else:
+        # covariance matrix with missing values or singular (e.g., more assets than observations),
+        # or singular 2x2 system
+        out_of_bounds = np.ones(n_points, dtype=bool)
+
+    # each optimization is warm started from the solution of the neighbouring target return, if solved
+    # right before, otherwise (e.g., first target of a run at the other end of the frontier) from the
+    # equally weighted portfolio
+    equal_weights = np.repeat(1 / n_assets, n_assets)
+    prev = None
+    for i in np.flatnonzero(out_of_bounds):
+        init_guess = weights[prev] if prev == i - 1 else equal_weights
+        weights[i] = minimize_volatility(
+            rets, covmatrix, target_rets[i], init_guess=init_guess
+        )
+        prev = i
     return weights
 
 
-def minimize_volatility(rets, covmatrix, target_return=None):
+def _normalize_cov(covmatrix):
+    """
+    Returns the covariance matrix normalized by the average variance of the assets, so that the
+    (absolute) tolerance of the scipy minimize optimizer on the portfolio variance is a relative one.
+    The matrix is returned as it is if all the variances are zero.
+    """
+    cov = np.asarray(covmatrix)
+    scale = np.trace(cov) / cov.shape[0]
+    return cov / scale if scale > 0 else cov
+
+
+def _is_solved(result, constraints, tol=1e-6):
+    """
+    Returns True if the scipy minimize optimizer terminated successfully and its solution satisfies
+    the equality constraints (up to tol)
+    """
+    return result.success and all(
+        np.all(np.abs(c["fun"](result.x, *c.get("args", ()))) <= tol)
+        for c in constraints
+    )
+
+
+def minimize_volatility(rets, covmatrix, target_return=None, init_guess=None):
     """
     Returns the optimal weights of the minimum volatility portfolio on the effient frontier.
     If target_return is not None, then the weights correspond to the minimum volatility portfolio
     having a fixed target return.
+    The variable init_guess is the starting point of the optimizer (equally weighted portfolio by default),
+    e.g., the solution of a neighbouring target return.
     The method uses the scipy minimize optimizer which solves the minimization problem
     for the volatility of the portfolio
     """
     n_assets = rets.shape[0]
-    # initial guess weights
-    init_guess = np.repeat(1 / n_assets, n_assets)
+    warm_start = init_guess is not None
+    if not warm_start:
+        # initial guess weights
+        init_guess = np.repeat(1 / n_assets, n_assets)
     weights_constraint = {"type": "eq", "fun": lambda w: 1.0 - np.sum(w)}
     if target_return is not None:
         return_constraint = {
@@ -476,17 +673,27 @@ def minimize_volatility(rets, covmatrix, target_return=None):
         }
         constr = (return_constraint, weights_constraint)
     else:
-        constr = weights_constraint
-
-    result = minimize(
-        portfolio_volatility,
-        init_guess,
-        args=(covmatrix,),
-        method="SLSQP",
-        options={"disp": False},
-        constraints=constr,
-        bounds=((0.0, 1.0),) * n_assets,
-    )  # bounds of each individual weight, i.e., w between 0 and 1
+        constr = (weights_constraint,)
+
+    # minimizing the variance gives the same weights of minimizing the volatility
+    scaled_cov = _normalize_cov(covmatrix)
+
+    def solve(x0):
+        return minimize(
+            _portfolio_variance,
+            x0,
+            args=(scaled_cov,),
+            jac=_portfolio_variance_jac,
+            method="SLSQP",
+            options={"disp": False},
+            constraints=constr,
+            bounds=((0.0, 1.0),) * n_assets,
+        )  # bounds of each individual weight, i.e., w between 0 and 1
+
+    result = solve(init_guess)
+    if warm_start and not _is_solved(result, constr):
+        # e.g., a warm start from a corner portfolio: restart from the equally weighted one
+        result = solve(np.repeat(1 / n_assets, n_assets))
     return result.x
 
 
@@ -529,10 +736,13 @@ def minimize_volatility_2(
         }
         constraints.append(return_constraint)
 
+    # same square-root free (and normalized) objective of minimize_volatility
+    scaled_cov = _normalize_cov(covmatrix)
     result = minimize(
-        portfolio_volatility,
+        _portfolio_variance,
         init_guess,
-        args=(covmatrix,),
+        args=(scaled_cov,),
+        jac=_portfolio_variance_jac,
         method="SLSQP",
         options={"disp": False},
         constraints=tuple(constraints),
@@ -553,41 +763,45 @@ def maximize_shape_ratio(
     """
     n_assets = rets.shape[0]
     init_guess = np.repeat(1 / n_assets, n_assets)
+    # loop invariants of the optimizer: returns and covariance matrix as np.array and
+    # annualization factor of the volatility
+    mu = np.asarray(rets)
+    Q = np.asarray(covmatrix)
+    sqrt_pp = np.sqrt(periods_per_year)
     weights_constraint = {"type": "eq", "fun": lambda w: 1.0 - np.sum(w)}
     if target_volatility is not None:
         volatility_constraint = {
             "type": "eq",
-            "args": (covmatrix, periods_per_year),
-            "fun": lambda w, cov, p: target_volatility
-            - annualize_vol(portfolio_volatility(w, cov), p),
+            "fun": lambda w: target_volatility - np.sqrt(w @ Q @ w) * sqrt_pp,
         }
         constr = (volatility_constraint, weights_constraint)
     else:
         constr = weights_constraint
 
-    def neg_portfolio_sharpe_ratio(
-        weights, rets, covmatrix, risk_free_rate, periods_per_year
-    ):
+    def neg_portfolio_sharpe_ratio(weights):
         """
-        Computes the negative annualized sharpe ratio for minimization problem of optimal portfolios.
-        The variable periods_per_year can be, e.g., 12, 52, 252, in case of yearly, weekly, and daily data.
+        Computes the negative annualized sharpe ratio for minimization problem of optimal portfolios,
+        i.e., -(portfolio_ret - risk_free_rate)/portfolio_vol with annualized return and volatility.
         The variable risk_free_rate is the annual one.
         """
-        # annualized portfolio returns
-        portfolio_ret = portfolio_return(weights, rets)
-        # annualized portfolio volatility
-        portfolio_vol = annualize_vol(
-            portfolio_volatility(weights, covmatrix), periods_per_year
-        )
-        return -sharpe_ratio(
-            portfolio_ret, risk_free_rate, periods_per_year, v=portfolio_vol
+        return -(weights @ mu - risk_free_rate) / (
+            np.sqrt(weights @ Q @ weights) * sqrt_pp
         )
-        # i.e., simply returns  -(portfolio_ret - risk_free_rate)/portfolio_vol
+
+    def neg_portfolio_sharpe_ratio_jac(weights):
+        """
+        Computes the analytical gradient of the negative annualized sharpe ratio with respect to the weights,
+        i.e., of -(w'mu - risk_free_rate) / sqrt(w'Qw * periods_per_year).
+        """
+        cov_weights = Q @ weights
+        vol = np.sqrt(weights @ cov_weights)
+        excess_ret = weights @ mu - risk_free_rate
+        return -(mu / vol - excess_ret * cov_weights / vol**3) / sqrt_pp
 
     result = minimize(
         neg_portfolio_sharpe_ratio,
         init_guess,
-        args=(rets, covmatrix, risk_free_rate, periods_per_year),
+        jac=neg_portfolio_sharpe_ratio_jac,
         method="SLSQP",
         options={"disp": False},
         constraints=constr,
@@ -603,7 +817,12 @@ def weigths_max_sharpe_ratio(covmat, mu_exc, scale=True):
     - covmat is the covariance N x N matrix as a pd.DataFrame
     Look at pag. 188 eq. (5.2.28) of "The econometrics of financial markets", by Campbell, Lo, Mackinlay.
     """
-    w = inverse_df(covmat).dot(mu_exc)
+    # solve covmat w = mu_exc via the Cholesky factorization instead of inverting covmat,
+    # with mu_exc aligned on the columns of covmat
+    w = pd.Series(
+        cho_solve(cho_factor(covmat.values), mu_exc.loc[covmat.columns].values),
+        index=covmat.index,
+    )
     if scale:
         # normalize weigths
         w = w / sum(w)